@@ -1,22 +1,56 @@
+import hashlib
+import json
 import os
+import queue
 import shutil
+import socket
 import subprocess
+import sys
+import tempfile
 import time
 import threading
 import tkinter as tk
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from tkinter import filedialog, messagebox
-from PIL import Image, ImageTk, ImageDraw
+from PIL import Image, ImageChops, ImageTk, ImageDraw
+
+try:
+    import numpy as np
+except ImportError:  # auto-fit falls back to plain PIL
+    np = None
 
 IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff")
 ORIG_BASE = r"\\pixartnas\home\INTERNAL_PROCESSING\ALL_PHOTOS\ORIGNAL"
-
-
-def list_image_pairs(input_folder):
+# Set to a local folder (e.g. on the SSD) to edit staged copies instead of the NAS files.
+STAGING_DIR = os.environ.get("DUAL_EDITOR_STAGING_DIR")
+STAGING_PREFETCH = 4
+STAGING_POLL_MS = 500
+# Keep one editor running and feed it later jobs over a local socket.
+RESIDENT_MODE = os.environ.get("DUAL_EDITOR_RESIDENT") == "1"
+SERVICE_PORT = int(os.environ.get("DUAL_EDITOR_PORT", "47613"))
+JOB_POLL_MS = 500
+WRITEBACK_RETRIES = 3
+WRITEBACK_RETRY_DELAY = 2.0
+PREFLIGHT_MAX_PIXELS = 60_000_000
+PREFLIGHT_MODES = ("1", "L", "LA", "P", "PA", "RGB", "RGBA")
+PREFLIGHT_DECODE_SIDE = 512
+# Allowed drift of a pair's FULL/PARTIAL aspect relation from the job's usual one.
+PREFLIGHT_ASPECT_TOLERANCE = 0.05
+# Upper bound for decoded pixels kept in the per-pair state cache.
+STATE_CACHE_BUDGET = 1536 * 1024 * 1024
+SUBJECT_SCAN_SIDE = 256
+SUBJECT_ALPHA_THRESHOLD = 16
+SUBJECT_BG_THRESHOLD = 48
+
+
+def list_image_pairs(input_folder, notify=True):
     full_dir = os.path.join(input_folder, "FULL")
     partial_dir = os.path.join(input_folder, "PARTIAL")
 
     if not os.path.isdir(full_dir) or not os.path.isdir(partial_dir):
-        messagebox.showerror("Error", "Input folder must contain FULL and PARTIAL subfolders.")
+        if notify:
+            messagebox.showerror("Error", "Input folder must contain FULL and PARTIAL subfolders.")
         return []
 
     full_files = {
@@ -38,28 +72,614 @@ def list_image_pairs(input_folder):
         partial_src = partial_files[name]
         pairs.append((full_src, partial_src))
 
-    if not pairs:
+    if not pairs and notify:
         messagebox.showinfo("No Images", "No matching image pairs were found.")
 
     return pairs
 
 
+def _bits_per_sample(img):
+    if img.mode.startswith(("I", "F")):
+        return 32 if img.mode in ("I", "F") else 16
+    # 16-bit colour PNG/TIFF still open as "RGB"; the raw mode or TIFF tag tells.
+    bits = getattr(img, "tag_v2", {}).get(258)
+    if bits:
+        return max(bits) if isinstance(bits, tuple) else bits
+    for tile in img.tile:
+        args = tile[3]
+        rawmode = args[0] if isinstance(args, tuple) else args
+        if isinstance(rawmode, str) and ";16" in rawmode:
+            return 16
+    return 8
+
+
+def _inspect_image(path):
+    info = {"path": path, "size": None, "mode": None, "decode_cost": 0, "problems": [], "fatal": False}
+    try:
+        with Image.open(path) as img:
+            info["size"] = img.size
+            info["mode"] = img.mode
+            bits = _bits_per_sample(img)
+            img.verify()
+        # verify() only checks PNG; decoding catches truncated JPEG/TIFF/BMP.
+        with Image.open(path) as img:
+            img.draft("RGB", (PREFLIGHT_DECODE_SIDE, PREFLIGHT_DECODE_SIDE))
+            img.load()
+    except Exception as exc:
+        info["problems"].append(f"unreadable ({exc})")
+        info["fatal"] = True
+        return info
+    w, h = info["size"]
+    # Editors hold RGBA copies, so that is what a decode costs in memory.
+    info["decode_cost"] = w * h * 4
+    if info["mode"] == "CMYK":
+        info["problems"].append("CMYK colour")
+    elif bits > 8:
+        info["problems"].append(f"{bits}-bit ({info['mode']})")
+    elif info["mode"] not in PREFLIGHT_MODES:
+        info["problems"].append(f"unusual mode {info['mode']}")
+    if w * h > PREFLIGHT_MAX_PIXELS:
+        info["problems"].append(f"very large ({w}x{h})")
+    return info
+
+
+class PreflightReport:
+    def __init__(self, pairs, infos):
+        self.infos = infos
+        self.entries = []
+        common_sizes = []
+        for side in (0, 1):
+            sizes = Counter(infos[pair[side]]["size"] for pair in pairs if infos[pair[side]]["size"])
+            common_sizes.append(sizes.most_common(1)[0][0] if sizes else None)
+        # FULL and PARTIAL are framed differently, so compare each pair's
+        # FULL-to-PARTIAL aspect relation with the one most of the job has.
+        relations = {pair: self._aspect_relation(infos, pair) for pair in pairs}
+        counts = Counter(rel for rel in relations.values() if rel)
+        common_relation = counts.most_common(1)[0][0] if counts else None
+        for pair in pairs:
+            problems = []
+            fatal = False
+            for side, label in ((0, "FULL"), (1, "PARTIAL")):
+                info = infos[pair[side]]
+                problems.extend(f"{label}: {p}" for p in info["problems"])
+                fatal = fatal or info["fatal"]
+                if info["size"] and common_sizes[side] and info["size"] != common_sizes[side]:
+                    w, h = info["size"]
+                    cw, ch = common_sizes[side]
+                    problems.append(f"{label}: {w}x{h}, most {label} files are {cw}x{ch}")
+            relation = relations[pair]
+            if relation and common_relation:
+                if abs(relation - common_relation) / common_relation > PREFLIGHT_ASPECT_TOLERANCE:
+                    problems.append("FULL and PARTIAL aspect ratios do not match the rest of the job")
+            self.entries.append({"pair": pair, "problems": problems, "fatal": fatal})
+
+    @staticmethod
+    def _aspect_relation(infos, pair):
+        full, partial = infos[pair[0]]["size"], infos[pair[1]]["size"]
+        if not (full and partial):
+            return None
+        return round((full[0] / full[1]) / (partial[0] / partial[1]), 2)
+
+    def flagged(self):
+        return [entry for entry in self.entries if entry["problems"]]
+
+    def problems_for(self, pair):
+        for entry in self.entries:
+            if entry["pair"] == tuple(pair):
+                return entry["problems"]
+        return []
+
+    def decode_cost(self, path):
+        info = self.infos.get(path)
+        return info["decode_cost"] if info else 0
+
+    def filter_pairs(self, skip_flagged):
+        return [
+            entry["pair"]
+            for entry in self.entries
+            if not entry["fatal"] and not (skip_flagged and entry["problems"])
+        ]
+
+    def summary(self, limit=15):
+        lines = []
+        for entry in self.flagged()[:limit]:
+            name = os.path.basename(entry["pair"][0])
+            lines.append(f"{name}: {'; '.join(entry['problems'])}")
+        if len(self.flagged()) > limit:
+            lines.append(f"... and {len(self.flagged()) - limit} more")
+        return "\n".join(lines)
+
+
+def preflight_pairs(pairs, pool=None):
+    paths = [path for pair in pairs for path in pair]
+    try:
+        if pool is not None:
+            results = list(pool.map(_inspect_image, paths, chunksize=8))
+        else:
+            with ProcessPoolExecutor() as pool:
+                results = list(pool.map(_inspect_image, paths, chunksize=8))
+    except Exception as exc:
+        print(f"Parallel pre-flight failed, scanning sequentially: {exc}")
+        results = [_inspect_image(path) for path in paths]
+    return PreflightReport(pairs, {info["path"]: info for info in results})
+
+
+def review_preflight(report):
+    flagged = report.flagged()
+    if not flagged:
+        return report.filter_pairs(skip_flagged=False)
+    fatal = sum(1 for entry in flagged if entry["fatal"])
+    response = messagebox.askyesnocancel(
+        "Pre-flight Check",
+        f"{len(flagged)} of {len(report.entries)} pairs have problems"
+        f" ({fatal} cannot be opened and will be skipped):\n\n{report.summary()}\n\n"
+        "Skip all flagged pairs? Choose No to keep the readable ones and edit them anyway.",
+    )
+    if response is None:
+        return []
+    return report.filter_pairs(skip_flagged=response)
+
+
+def _guide_rows(h, is_partial=False):
+    if not is_partial:
+        return int(h * 56 / 300), int(h * 272 / 300)
+    return 76, 210
+
+
 def _draw_guides(canvas, w, h, is_partial=False):
     canvas.delete("guides")
     x_mid = w // 2
-    if not is_partial:
-        y1 = int(h * 56 / 300)
-        y2 = int(h * 272 / 300)
-        canvas.create_line(0, y1, w, y1, fill="lime", dash=(3, 2), tags="guides")
-        canvas.create_line(0, y2, w, y2, fill="lime", dash=(3, 2), tags="guides")
-    else:
-        canvas.create_line(0, 76, w, 76, fill="lime", dash=(3, 2), tags="guides")
-        canvas.create_line(0, 210, w, 210, fill="lime", dash=(3, 2), tags="guides")
+    for y in _guide_rows(h, is_partial):
+        canvas.create_line(0, y, w, y, fill="lime", dash=(3, 2), tags="guides")
     canvas.create_line(x_mid, 0, x_mid, h, fill="lime", dash=(3, 2), tags="guides")
 
 
+def subject_bounds(img):
+    """Return the subject box as (left, top, right, bottom) fractions of ``img``.
+
+    Uses the alpha channel when the image has transparency, otherwise pixels
+    that differ from the background colour along the border. Works on a
+    reduced copy.
+    """
+    scale = SUBJECT_SCAN_SIDE / max(img.size)
+    if scale < 1:
+        size = (max(1, int(img.width * scale)), max(1, int(img.height * scale)))
+        img = img.resize(size, Image.BILINEAR, reducing_gap=2.0)
+    if img.mode != "RGBA":
+        img = img.convert("RGBA")
+    w, h = img.size
+    if np is not None:
+        arr = np.asarray(img)
+        alpha = arr[..., 3]
+        if alpha.min() < 255 - SUBJECT_ALPHA_THRESHOLD:
+            mask = alpha > SUBJECT_ALPHA_THRESHOLD
+        else:
+            rgb = arr[..., :3].astype(np.int16)
+            border = np.concatenate([rgb[0], rgb[-1], rgb[:, 0], rgb[:, -1]])
+            background = np.median(border, axis=0)
+            mask = np.abs(rgb - background).sum(axis=2) > SUBJECT_BG_THRESHOLD
+        rows = np.flatnonzero(mask.any(axis=1))
+        cols = np.flatnonzero(mask.any(axis=0))
+        if not rows.size:
+            return None
+        box = (cols[0], rows[0], cols[-1] + 1, rows[-1] + 1)
+    else:
+        alpha = img.getchannel("A")
+        if alpha.getextrema()[0] < 255 - SUBJECT_ALPHA_THRESHOLD:
+            mask = alpha.point(lambda v: 255 if v > SUBJECT_ALPHA_THRESHOLD else 0)
+        else:
+            rgb = img.convert("RGB")
+            background = Image.new("RGB", rgb.size, rgb.getpixel((0, 0)))
+            diff = ImageChops.difference(rgb, background).convert("L")
+            mask = diff.point(lambda v: 255 if v * 3 > SUBJECT_BG_THRESHOLD else 0)
+        box = mask.getbbox()
+        if not box:
+            return None
+    left, top, right, bottom = box
+    return (left / w, top / h, right / w, bottom / h)
+
+
+def _subject_bounds_for_path(path):
+    try:
+        mtime = os.path.getmtime(path)
+        with Image.open(path) as img:
+            img.draft("RGB", (SUBJECT_SCAN_SIDE * 2, SUBJECT_SCAN_SIDE * 2))
+            return path, mtime, subject_bounds(img)
+    except Exception as exc:
+        print(f"Failed to find subject in {path}: {exc}")
+        return path, None, None
+
+
+class SubjectIndex:
+    """Subject bounds per file, filled in the background by ``prefit``."""
+
+    def __init__(self, pool=None):
+        self._bounds = {}
+        self._lock = threading.Lock()
+        self._pool = pool
+        self._owns_pool = pool is None
+
+    def get(self, path, mtime):
+        with self._lock:
+            entry = self._bounds.get(path)
+        if entry and entry[0] == mtime:
+            return entry[1]
+        return None
+
+    def prefit(self, paths):
+        with self._lock:
+            todo = [path for path in paths if path not in self._bounds]
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor()
+        if todo:
+            threading.Thread(target=self._prefit, args=(todo,), daemon=True).start()
+
+    def _prefit(self, paths):
+        try:
+            for path, mtime, bounds in self._pool.map(_subject_bounds_for_path, paths, chunksize=8):
+                if mtime is not None:
+                    with self._lock:
+                        self._bounds[path] = (mtime, bounds)
+        except Exception as exc:
+            print(f"Subject pre-fit stopped: {exc}")
+
+    def close(self):
+        if self._owns_pool and self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class JobServer:
+    """Receives input folders from later launches of the editor."""
+
+    def __init__(self, port=SERVICE_PORT):
+        self.port = port
+        self.jobs = queue.Queue()
+        self._sock = None
+
+    def start(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if hasattr(socket, "SO_EXCLUSIVEADDRUSE"):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+        else:
+            # On POSIX this only skips TIME_WAIT; a second listener still fails to bind.
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind(("127.0.0.1", self.port))
+            sock.listen()
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            with conn:
+                try:
+                    conn.settimeout(5)
+                    folder = json.loads(conn.makefile("r", encoding="utf-8").readline())["folder"]
+                    self.jobs.put(folder)
+                    conn.sendall(b"queued\n")
+                except Exception as exc:
+                    print(f"Rejected job request: {exc}")
+
+    def drain(self):
+        folders = []
+        while True:
+            try:
+                folders.append(self.jobs.get_nowait())
+            except queue.Empty:
+                return folders
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                # Wakes the blocked accept() so the port is released right away.
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+
+
+def send_job(folder, port=SERVICE_PORT):
+    """Hand ``folder`` to a running editor; returns False if none is listening."""
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=2) as conn:
+            conn.sendall((json.dumps({"folder": os.path.abspath(folder)}) + "\n").encode("utf-8"))
+            return conn.makefile("r", encoding="utf-8").readline().strip() == "queued"
+    except OSError:
+        return False
+
+
+class StagingCache:
+    """Local working copies of NAS files with background write-back.
+
+    Files are copied under ``root`` ahead of the cursor and edited there.
+    ``write_back`` queues a copy back to the original location. A file that
+    changed on the NAS since it was staged is never overwritten; a
+    ``("conflict", remote, local)`` event is posted to ``events`` instead.
+    What was staged is recorded in ``staging.json`` so unsynced copies
+    survive a restart.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.events = queue.Queue()
+        self._manifest = os.path.join(root, "staging.json")
+        self._manifest_lock = threading.Lock()
+        self._entries = self._load_manifest()
+        self._remote_by_local = {entry["local"]: remote for remote, entry in self._entries.items()}
+        self._futures = {}
+        self._path_locks = {}
+        self._conflicts = set()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="staging")
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+        # Leftovers from the last session are pushed, or reported as conflicts.
+        for remote in self._entries:
+            self._queue.put(remote)
+
+    def _load_manifest(self):
+        if not os.path.exists(self._manifest):
+            return {}
+        try:
+            with open(self._manifest, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            return {remote: entry for remote, entry in entries.items() if os.path.exists(entry["local"])}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+            print(f"Failed to read staging manifest {self._manifest}: {exc}")
+            return {}
+
+    def _save_manifest(self):
+        # Stage workers and the writer all call this; one write at a time.
+        with self._manifest_lock:
+            with self._lock:
+                entries = {remote: dict(entry) for remote, entry in self._entries.items()}
+            tmp = None
+            try:
+                os.makedirs(self.root, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(prefix="staging.", suffix=".part", dir=self.root)
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entries, f)
+                os.replace(tmp, self._manifest)
+            except OSError as exc:
+                print(f"Failed to save staging manifest: {exc}")
+                if tmp and os.path.exists(tmp):
+                    os.remove(tmp)
+
+    def _local_for(self, remote):
+        folder = os.path.dirname(os.path.normcase(os.path.abspath(remote)))
+        digest = hashlib.sha1(folder.encode("utf-8")).hexdigest()[:12]
+        name = f"{os.path.basename(folder)}_{digest}"
+        return os.path.join(self.root, name, os.path.basename(remote))
+
+    def _path_lock(self, remote):
+        with self._lock:
+            return self._path_locks.setdefault(remote, threading.Lock())
+
+    def _stage(self, remote):
+        with self._path_lock(remote):
+            remote_mtime = os.path.getmtime(remote)
+            entry = self._entries.get(remote)
+            if entry and os.path.exists(entry["local"]):
+                if os.path.getmtime(entry["local"]) != entry["local_mtime"]:
+                    # Unsynced local edits win; write-back reports any conflict.
+                    return entry["local"]
+                if entry["remote_mtime"] == remote_mtime:
+                    return entry["local"]
+            local = self._local_for(remote)
+            os.makedirs(os.path.dirname(local), exist_ok=True)
+            tmp = local + ".part"
+            shutil.copy2(remote, tmp)
+            os.replace(tmp, local)
+            with self._lock:
+                self._remote_by_local[local] = remote
+                self._entries[remote] = {
+                    "local": local,
+                    "remote_mtime": remote_mtime,
+                    "local_mtime": os.path.getmtime(local),
+                }
+        self._save_manifest()
+        return local
+
+    def prefetch(self, paths):
+        # Finished entries are checked again; _stage is cheap when nothing changed.
+        with self._lock:
+            for remote in paths:
+                future = self._futures.get(remote)
+                if future is None or future.done():
+                    self._futures[remote] = self._pool.submit(self._stage, remote)
+
+    def local_path(self, remote):
+        """Return the staged copy of ``remote``, falling back to the NAS path.
+
+        A copy staged earlier is returned straight away and checked against
+        the NAS in the background; if the NAS file changed, the local copy is
+        refreshed and the editor picks it up as an external change.
+        """
+        with self._lock:
+            future = self._futures.get(remote)
+            if future is None or (future.done() and future.exception() is not None):
+                future = self._futures[remote] = self._pool.submit(self._stage, remote)
+            elif future.done():
+                self._futures[remote] = self._pool.submit(self._stage, remote)
+        try:
+            return future.result()
+        except OSError as exc:
+            print(f"Failed to stage {remote}: {exc}")
+            return remote
+
+    def remote_path(self, local):
+        with self._lock:
+            return self._remote_by_local.get(local)
+
+    def write_back(self, local):
+        remote = self.remote_path(local)
+        if remote:
+            self._queue.put(remote)
+
+    def resolve_conflict(self, remote, keep_local):
+        """Overwrite the NAS copy with the local edits, or drop the local edits."""
+        with self._path_lock(remote):
+            self._conflicts.discard(remote)
+            entry = self._entries.get(remote)
+            if not entry:
+                return
+            if not keep_local:
+                with self._lock:
+                    del self._entries[remote]
+                    self._remote_by_local.pop(entry["local"], None)
+                    self._futures.pop(remote, None)
+            else:
+                try:
+                    entry["remote_mtime"] = os.path.getmtime(remote)
+                except OSError:
+                    entry["remote_mtime"] = None
+        if keep_local:
+            self._queue.put(remote)
+        else:
+            self.local_path(remote)
+
+    def unsynced(self):
+        """Return ``(remote, local)`` for local copies not yet on the NAS."""
+        with self._lock:
+            entries = list(self._entries.items())
+        pending = []
+        for remote, entry in entries:
+            try:
+                if os.path.getmtime(entry["local"]) != entry["local_mtime"]:
+                    pending.append((remote, entry["local"]))
+            except OSError:
+                continue
+        return pending
+
+    def _sync(self, remote):
+        with self._path_lock(remote):
+            entry = self._entries.get(remote)
+            if not entry:
+                return
+            local_mtime = os.path.getmtime(entry["local"])
+            if local_mtime == entry["local_mtime"]:
+                return
+            try:
+                remote_mtime = os.path.getmtime(remote)
+            except FileNotFoundError:
+                remote_mtime = None
+            if remote_mtime != entry["remote_mtime"]:
+                if remote not in self._conflicts:
+                    self._conflicts.add(remote)
+                    self.events.put(("conflict", remote, entry["local"]))
+                return
+            tmp = remote + ".staging"
+            shutil.copy2(entry["local"], tmp)
+            os.replace(tmp, remote)
+            entry["remote_mtime"] = os.path.getmtime(remote)
+            entry["local_mtime"] = local_mtime
+        self._save_manifest()
+
+    def _write_loop(self):
+        while True:
+            remote = self._queue.get()
+            try:
+                if remote is None:
+                    return
+                for attempt in range(WRITEBACK_RETRIES):
+                    try:
+                        self._sync(remote)
+                        break
+                    except OSError as exc:
+                        if attempt + 1 == WRITEBACK_RETRIES:
+                            print(f"Failed to write back {remote}: {exc}")
+                            self.events.put(("error", remote, exc))
+                        else:
+                            time.sleep(WRITEBACK_RETRY_DELAY * (attempt + 1))
+                    except Exception as exc:
+                        # Keep the writer alive for the rest of the queue.
+                        print(f"Failed to write back {remote}: {exc}")
+                        self.events.put(("error", remote, exc))
+                        break
+            finally:
+                self._queue.task_done()
+
+    def drain_events(self):
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def flush(self):
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(None)
+        self._writer.join()
+        self._pool.shutdown(wait=False)
+        self._save_manifest()
+
+
+class ImageHandle:
+    """Shared, read-only reference to a PIL image.
+
+    Handles are passed around instead of copying pixels. Anyone that needs to
+    draw on the image calls ``writable()`` first, which only copies when the
+    pixels are still referenced elsewhere (history, state cache, ...).
+    """
+
+    def __init__(self, image):
+        self._image = image
+        self._refs = 1
+        self._lock = threading.Lock()
+
+    @property
+    def image(self):
+        return self._image
+
+    @property
+    def size(self):
+        return self._image.size
+
+    def share(self):
+        with self._lock:
+            self._refs += 1
+        return self
+
+    def release(self):
+        with self._lock:
+            self._refs = max(0, self._refs - 1)
+
+    def writable(self):
+        """Return a handle that is safe to draw on.
+
+        A shared image comes back as a fresh copy; the caller still owns its
+        reference to this handle and must ``release()`` it.
+        """
+        with self._lock:
+            if self._refs <= 1:
+                return self
+        return ImageHandle(self._image.copy())
+
+
+def _release_state(state):
+    if not state:
+        return
+    handle = state.get("edit")
+    if handle is not None:
+        handle.release()
+    for entry in state.get("history", []):
+        if entry.get("image") is not None:
+            entry["image"].release()
+
+
 class ImageEditorWidget(tk.Frame):
-    def __init__(self, master, img_path, canvas_w, canvas_h):
+    def __init__(self, master, img_path, canvas_w, canvas_h, state=None):
         super().__init__(
             master,
             bg="#2b2b2b",
@@ -72,8 +692,10 @@ class ImageEditorWidget(tk.Frame):
         self.canvas_w = canvas_w
         self.canvas_h = canvas_h
 
-        self.orig_pil = Image.open(img_path).convert("RGBA")
-        self.edit_pil = self.orig_pil.copy()
+        self.orig_size = None
+        self._edit = None
+        if state is None:
+            self._load_image()
 
         self.history = []
         self.history_index = -1
@@ -112,9 +734,38 @@ class ImageEditorWidget(tk.Frame):
         self.canvas.bind("<ButtonPress-1>", self._on_down, add="+")
         self.canvas.bind("<B1-Motion>", self._on_move)
         self.canvas.bind("<ButtonRelease-1>", self._on_up)
-        self._render()
-        self.refresh_mod_time()
-        self._reset_history()
+        if state is not None:
+            # A cached pair reuses its handles: no decode and a single render.
+            self.restore_state(state)
+        else:
+            self._render()
+            self.refresh_mod_time()
+            self._reset_history()
+
+    @property
+    def edit_pil(self):
+        return self._edit.image
+
+    def _set_edit(self, handle):
+        if self._edit is not None and self._edit is not handle:
+            self._edit.release()
+        self._edit = handle
+
+    def _load_image(self):
+        img = Image.open(self.img_path).convert("RGBA")
+        self.orig_size = img.size
+        self._set_edit(ImageHandle(img))
+
+    def _release_history(self, entries):
+        for entry in entries:
+            if entry["image"] is not None:
+                entry["image"].release()
+
+    def destroy(self):
+        self._release_history(self.history)
+        self.history = []
+        self._set_edit(None)
+        super().destroy()
 
     def export_state(self):
         history_copy = []
@@ -122,7 +773,7 @@ class ImageEditorWidget(tk.Frame):
             image_ref = entry["image"]
             history_copy.append(
                 {
-                    "image": image_ref.copy() if image_ref is not None else None,
+                    "image": image_ref.share() if image_ref is not None else None,
                     "rotation": entry["rotation"],
                     "zoom": entry["zoom"],
                     "img_pos_x": entry["img_pos_x"],
@@ -130,7 +781,7 @@ class ImageEditorWidget(tk.Frame):
                 }
             )
         return {
-            "edit_pil": self.edit_pil.copy(),
+            "edit": self._edit.share(),
             "history": history_copy,
             "history_index": self.history_index,
             "saved_history_index": self.saved_history_index,
@@ -141,18 +792,21 @@ class ImageEditorWidget(tk.Frame):
             "brush_radius": self.brush_radius,
             "dirty": self.dirty,
             "last_mod_time": self.last_mod_time,
+            "orig_size": self.orig_size,
         }
 
     def restore_state(self, state):
         if not state:
             return
-        self.edit_pil = state["edit_pil"].copy()
+        self._set_edit(state["edit"].share())
+        self.orig_size = state.get("orig_size", self.orig_size)
+        self._release_history(self.history)
         self.history = []
         for entry in state.get("history", []):
             image_ref = entry.get("image")
             self.history.append(
                 {
-                    "image": image_ref.copy() if image_ref is not None else None,
+                    "image": image_ref.share() if image_ref is not None else None,
                     "rotation": entry.get("rotation", 0.0),
                     "zoom": entry.get("zoom", 1.0),
                     "img_pos_x": entry.get("img_pos_x", 0),
@@ -177,7 +831,7 @@ class ImageEditorWidget(tk.Frame):
 
     def _capture_state(self, copy_image=True):
         return {
-            "image": self.edit_pil.copy() if copy_image else None,
+            "image": self._edit.share() if copy_image else None,
             "rotation": self.rotation,
             "zoom": self.zoom,
             "img_pos_x": self.img_pos_x,
@@ -187,6 +841,7 @@ class ImageEditorWidget(tk.Frame):
     def _push_history(self, mark_dirty=True, copy_image=True):
         state = self._capture_state(copy_image=copy_image)
         if self.history_index < len(self.history) - 1:
+            self._release_history(self.history[self.history_index + 1 :])
             self.history = self.history[: self.history_index + 1]
         self.history.append(state)
         self.history_index = len(self.history) - 1
@@ -216,15 +871,17 @@ class ImageEditorWidget(tk.Frame):
         img.save(path)
 
     def save(self):
-        target_w, target_h = self.orig_pil.size
+        target_w, target_h = self.orig_size
         rotated = self.edit_pil.rotate(self.rotation, expand=True, resample=Image.BICUBIC)
         base_scale = min(target_w / rotated.width, target_h / rotated.height)
         save_scale = base_scale * self.zoom
         new_w = max(1, int(rotated.width * save_scale))
         new_h = max(1, int(rotated.height * save_scale))
         scaled = rotated.resize((new_w, new_h), Image.LANCZOS)
-        pan_x_img = int(self.img_pos_x * (target_w / self.canvas_w))
-        pan_y_img = int(self.img_pos_y * (target_h / self.canvas_h))
+        # img_pos is in preview pixels; map it through the preview's own fit scale.
+        canvas_scale = min(self.canvas_w / rotated.width, self.canvas_h / rotated.height)
+        pan_x_img = int(round(self.img_pos_x / canvas_scale * base_scale))
+        pan_y_img = int(round(self.img_pos_y / canvas_scale * base_scale))
         final = Image.new("RGBA", (target_w, target_h), (255, 255, 255, 0))
         x = (target_w - new_w) // 2 + pan_x_img
         y = (target_h - new_h) // 2 + pan_y_img
@@ -237,16 +894,21 @@ class ImageEditorWidget(tk.Frame):
         else:
             final.save(self.img_path)
         self.refresh_mod_time()
+        self._notify_file_written()
+
+    def _notify_file_written(self):
+        if hasattr(self.master, "on_editor_file_written"):
+            self.master.on_editor_file_written(self)
 
     def _get_history_image(self, idx):
         for i in range(idx, -1, -1):
             img = self.history[i]["image"]
             if img is not None:
-                return img.copy()
-        return self.edit_pil.copy()
+                return img.share()
+        return self._edit
 
     def _restore_state(self, state, idx):
-        self.edit_pil = self._get_history_image(idx)
+        self._set_edit(self._get_history_image(idx))
         self.rotation = state["rotation"]
         self.zoom = state["zoom"]
         self.img_pos_x = state["img_pos_x"]
@@ -254,6 +916,7 @@ class ImageEditorWidget(tk.Frame):
         self._render()
 
     def _reset_history(self):
+        self._release_history(self.history)
         self.history = []
         self.history_index = -1
         self.saved_history_index = -1
@@ -305,6 +968,9 @@ class ImageEditorWidget(tk.Frame):
         ix1, iy1 = self._to_img(e.x, e.y)
         scale = self._last_scale or 1.0
         lw = max(1, int(2 * self.brush_radius / scale))
+        if not self._stroke_changed:
+            # Strokes draw in place, so detach from history/cache before the first one.
+            self._set_edit(self._edit.writable())
         r = max(1, int(self.brush_radius / scale))
         alpha = self.edit_pil.split()[3]
         draw = ImageDraw.Draw(alpha)
@@ -340,9 +1006,7 @@ class ImageEditorWidget(tk.Frame):
             return
         new_img = Image.new("RGBA", self.edit_pil.size, (0, 0, 0, 0))
         new_img.paste(self.edit_pil, (shift_x, shift_y))
-        self.edit_pil = new_img
-        self.img_pos_x = 0
-        self.img_pos_y = 0
+        self._set_edit(ImageHandle(new_img))
         self._render()
         self._push_history()
 
@@ -360,13 +1024,37 @@ class ImageEditorWidget(tk.Frame):
     def rotate_by(self, deg):
         if deg == 0:
             return
-        self.edit_pil = self.edit_pil.rotate(deg, expand=True, resample=Image.BICUBIC)
+        self._set_edit(ImageHandle(self.edit_pil.rotate(deg, expand=True, resample=Image.BICUBIC)))
         self.rotation = 0.0
         self.img_pos_x = 0
         self.img_pos_y = 0
         self._render()
         self._push_history()
 
+    def auto_fit(self, bounds=None):
+        """Zoom and move so the subject fills the space between the guides."""
+        if bounds is None:
+            bounds = subject_bounds(self.edit_pil)
+        if not bounds:
+            return False
+        left, top, right, bottom = bounds
+        if bottom <= top:
+            return False
+        w, h = self.edit_pil.size
+        y1, y2 = _guide_rows(self.canvas_h, is_partial=(self.canvas_w == 613))
+        base_scale = min(self.canvas_w / w, self.canvas_h / h)
+        zoom = (y2 - y1) / ((bottom - top) * h * base_scale)
+        self.zoom = max(0.1, min(zoom, 10.0))
+        scale = base_scale * self.zoom
+        disp_w = max(1, int(w * scale))
+        disp_h = max(1, int(h * scale))
+        # Offsets are in canvas pixels; _render and save() apply them.
+        self.img_pos_x = int(round(self.canvas_w // 2 - ((self.canvas_w - disp_w) // 2 + (left + right) / 2 * disp_w)))
+        self.img_pos_y = int(round(y1 - ((self.canvas_h - disp_h) // 2 + top * disp_h)))
+        self._render()
+        self._push_history(copy_image=False)
+        return True
+
     def undo(self):
         if self.history_index > 0:
             self.history_index -= 1
@@ -396,8 +1084,7 @@ class ImageEditorWidget(tk.Frame):
     def reload_image(self, mod_time=None):
         """Reload image if edited externally (e.g., Photoshop)."""
         try:
-            self.orig_pil = Image.open(self.img_path).convert("RGBA")
-            self.edit_pil = self.orig_pil.copy()
+            self._load_image()
             self._render()
             self._reset_history()
             if mod_time is None:
@@ -405,24 +1092,40 @@ class ImageEditorWidget(tk.Frame):
             else:
                 self.last_mod_time = mod_time
             self.mark_saved()
+            self._notify_file_written()
         except Exception as e:
             print(f"Failed to reload image: {e}")
 
 
 class DualEditor(tk.Tk):
-    def __init__(self, input_folder, pairs):
+    def __init__(
+        self,
+        input_folder,
+        pairs,
+        staging=None,
+        preflight=None,
+        subject_index=None,
+        job_server=None,
+        pool=None,
+    ):
         super().__init__()
         self.title("Dual Photo Editor")
         self.geometry("1600x980")
-        self.input_folder = input_folder
-        self.full_dir = os.path.join(input_folder, "FULL")
-        self.partial_dir = os.path.join(input_folder, "PARTIAL")
-        self.pairs = pairs
-        self.index = 0
         self.left = None
         self.right = None
         self.focused = None
         self.unsaved_changes = False
+        self._editor_states = {}
+        self.staging = staging
+        self.subject_index = subject_index
+        self.job_server = job_server
+        self.worker_pool = pool
+        self._pending_jobs = []
+        self._starting_job = False
+        self._idle_label = None
+        self.auto_fit_on_open = tk.BooleanVar(self, value=False)
+        if self.staging:
+            self.after(STAGING_POLL_MS, self._poll_staging)
 
         self.photoshop_path_file = "photoshop_path.txt"
         self.photoshop_path = self._load_photoshop_path() or r"C:\Program Files\Adobe\Adobe Photoshop 2025\Photoshop.exe"
@@ -437,6 +1140,16 @@ class DualEditor(tk.Tk):
 
         self.brush_label = tk.Label(bar, text="20", bg="#333", fg="white")
         self.brush_label.pack(side="left", padx=20)
+        tk.Button(bar, text="Auto-fit (F)", command=lambda: self.auto_fit(both=True), takefocus=False).pack(side="left", padx=10)
+        tk.Checkbutton(
+            bar,
+            text="Auto-fit on open",
+            variable=self.auto_fit_on_open,
+            bg="#333",
+            fg="white",
+            selectcolor="#333",
+            takefocus=False,
+        ).pack(side="left", padx=(0, 10))
         tk.Button(bar, text="Save", bg="#9f9", command=self._save, takefocus=False).pack(side="left")
         tk.Button(bar, text="Replace Original", bg="#ff6666", command=self._replace_original, takefocus=False).pack(side="left", padx=10)
         tk.Button(bar, text="Next →", bg="#9ff", command=self.next, takefocus=False).pack(side="right", padx=6)
@@ -455,6 +1168,8 @@ class DualEditor(tk.Tk):
             self._bind_edit_key(key, "zoom", 1.02)
         for key in ("-", "_", "<KP_Subtract>"):
             self._bind_edit_key(key, "zoom", 0.98)
+        self._bind_edit_key("f", "autofit")
+        self.bind_all("F", lambda e: self.auto_fit(both=True))
         self._bind_edit_key("/", "rotate", -3)
         self._bind_edit_key("*", "rotate", 3)
         for k, dx, dy in [("<Left>", -2, 0), ("<Right>", 2, 0), ("<Up>", 0, -2), ("<Down>", 0, 2)]:
@@ -472,8 +1187,110 @@ class DualEditor(tk.Tk):
 
         self.bind("<FocusIn>", self._check_external_updates)
 
+        if self.job_server:
+            self.after(JOB_POLL_MS, self._poll_jobs)
+        self.start_job(input_folder, pairs, preflight)
+
+    def start_job(self, input_folder, pairs, preflight=None):
+        self.input_folder = input_folder
+        self.full_dir = os.path.join(input_folder, "FULL")
+        self.partial_dir = os.path.join(input_folder, "PARTIAL")
+        self.pairs = pairs
+        self.preflight = preflight
+        self.index = 0
         self._load(0)
 
+    # --- Resident service ---
+    def _poll_jobs(self):
+        for folder in self.job_server.drain():
+            self.enqueue_job(folder)
+        self.after(JOB_POLL_MS, self._poll_jobs)
+
+    def enqueue_job(self, folder):
+        job = {"folder": folder, "pairs": [], "preflight": None, "ready": threading.Event()}
+        self._pending_jobs.append(job)
+        threading.Thread(target=self._prepare_job, args=(job,), daemon=True).start()
+        if self._idle_label and not self._starting_job:
+            self._start_next_job()
+        else:
+            self._update_title()
+
+    def _prepare_job(self, job):
+        # Runs while the current job is still being edited.
+        try:
+            pairs = list_image_pairs(job["folder"], notify=False)
+            if pairs:
+                job["preflight"] = preflight_pairs(pairs, pool=self.worker_pool)
+                if self.subject_index:
+                    self.subject_index.prefit([path for pair in pairs for path in pair])
+                if self.staging:
+                    self.staging.prefetch([path for pair in pairs[:STAGING_PREFETCH] for path in pair])
+            job["pairs"] = pairs
+        except Exception as exc:
+            print(f"Failed to prepare job {job['folder']}: {exc}")
+        finally:
+            job["ready"].set()
+
+    def _start_next_job(self):
+        self._show_idle()
+        if self._starting_job:
+            return
+        self._starting_job = True
+        self._try_start_job()
+
+    def _try_start_job(self):
+        # Polled with after() so the window stays responsive while a job is scanned.
+        while self._pending_jobs:
+            job = self._pending_jobs[0]
+            if not job["ready"].is_set():
+                self._idle_label.config(text=f"Preparing {job['folder']}...")
+                self.after(JOB_POLL_MS, self._try_start_job)
+                return
+            self._pending_jobs.pop(0)
+            if not job["pairs"]:
+                messagebox.showinfo("No Images", f"No matching image pairs were found in:\n{job['folder']}")
+                continue
+            pairs = review_preflight(job["preflight"]) if job["preflight"] else job["pairs"]
+            if pairs:
+                self._starting_job = False
+                self.start_job(job["folder"], pairs, job["preflight"])
+                return
+        self._starting_job = False
+        self._idle_label.config(text="Waiting for the next job...")
+        self._update_title()
+
+    def _show_idle(self):
+        if self._idle_label:
+            return
+        for editor in (self.left, self.right):
+            self._cache_editor_state(editor)
+            if editor:
+                editor.destroy()
+        self.left = None
+        self.right = None
+        self.focused = None
+        self.pairs = []
+        self.preflight = None
+        self.index = 0
+        self._idle_label = tk.Label(self, text="Waiting for the next job...", fg="#888", font=("Segoe UI", 16))
+        self._idle_label.pack(expand=True)
+        self._update_title()
+
+    def _report_dropped_jobs(self):
+        # Senders were told "queued", so say which folders will not be opened.
+        folders = [job["folder"] for job in self._pending_jobs] + self.job_server.drain()
+        self._pending_jobs = []
+        if not folders:
+            return
+        names = "\n".join(folders[:10])
+        if len(folders) > 10:
+            names += f"\n... and {len(folders) - 10} more"
+        messagebox.showwarning(
+            "Queued Jobs Not Opened",
+            f"These queued folders were not opened:\n\n{names}\n\n"
+            "Start the editor again with each folder to edit them.",
+        )
+
     def _bind_edit_key(self, sequence, action, *params):
         def handler(event, action=action, params=params):
             self._do(action, *params)
@@ -482,6 +1299,9 @@ class DualEditor(tk.Tk):
         self.bind_all(sequence, handler)
 
     def _load(self, i):
+        if self._idle_label:
+            self._idle_label.destroy()
+            self._idle_label = None
         for editor in (self.left, self.right):
             self._cache_editor_state(editor)
             if editor:
@@ -489,13 +1309,43 @@ class DualEditor(tk.Tk):
         self.left = None
         self.right = None
         lf, rt = self.pairs[i]
-        self.left = ImageEditorWidget(self, lf, 300, 300)
-        self.right = ImageEditorWidget(self, rt, 613, 713)
+        if self.staging:
+            lf = self.staging.local_path(lf)
+            rt = self.staging.local_path(rt)
+            ahead = self.pairs[i + 1 : i + 1 + STAGING_PREFETCH]
+            self.staging.prefetch([path for pair in ahead for path in pair])
+        self.left, left_restored = self._open_editor(lf, 300, 300)
+        self.right, right_restored = self._open_editor(rt, 613, 713)
         self.left.pack(side="left", expand=True, padx=20, pady=20)
         self.right.pack(side="right", expand=True, padx=20, pady=20)
-        self._restore_editor_state(self.left)
-        self._restore_editor_state(self.right)
+        for editor, restored in ((self.left, left_restored), (self.right, right_restored)):
+            if not restored and self.auto_fit_on_open.get():
+                editor.auto_fit(self._indexed_bounds(editor))
         self.focus_editor(self.left if self.left else self.right)
+        self._update_title()
+
+    def _indexed_bounds(self, editor):
+        if not self.subject_index:
+            return None
+        remote = self.staging.remote_path(editor.img_path) if self.staging else editor.img_path
+        return self.subject_index.get(remote or editor.img_path, editor.last_mod_time)
+
+    def auto_fit(self, both=False):
+        for editor in (self.left, self.right) if both else (self.focused,):
+            if editor and not editor.auto_fit():
+                print(f"No subject found in {editor.img_path}")
+
+    def _update_title(self):
+        if not 0 <= self.index < len(self.pairs):
+            title = "Dual Photo Editor - waiting for the next job"
+        else:
+            title = f"Dual Photo Editor - {self.index + 1}/{len(self.pairs)}"
+            problems = self.preflight.problems_for(self.pairs[self.index]) if self.preflight else []
+            if problems:
+                title += " - WARNING: " + "; ".join(problems)
+        if self._pending_jobs:
+            title += f" - {len(self._pending_jobs)} job(s) queued"
+        self.title(title)
 
     def focus_editor(self, e):
         self.focused = e
@@ -523,6 +1373,42 @@ class DualEditor(tk.Tk):
             self.focus_editor(next_editor)
         return "break"
 
+    def on_editor_file_written(self, editor):
+        if self.staging:
+            self.staging.write_back(editor.img_path)
+
+    def _poll_staging(self):
+        for kind, remote, detail in self.staging.drain_events():
+            if kind == "conflict":
+                self._on_staging_conflict(remote, detail)
+            else:
+                messagebox.showerror("Sync Error", f"Failed to copy back to the NAS:\n{remote}\n{detail}")
+        self.after(STAGING_POLL_MS, self._poll_staging)
+
+    def _report_unsynced(self):
+        unsynced = self.staging.unsynced()
+        if not unsynced:
+            return
+        names = "\n".join(remote for remote, _ in unsynced[:10])
+        if len(unsynced) > 10:
+            names += f"\n... and {len(unsynced) - 10} more"
+        messagebox.showwarning(
+            "Not Copied Back",
+            f"These edits were not copied back to the NAS:\n\n{names}\n\n"
+            f"They are kept in {self.staging.root} and will be offered again next time.",
+        )
+
+    def _on_staging_conflict(self, remote, local):
+        keep_local = messagebox.askyesno(
+            "Sync Conflict",
+            f"{remote}\nwas changed on the NAS after it was copied for editing.\n\n"
+            "Overwrite it with your edits? Choose No to discard your edits and use the NAS version.",
+        )
+        self.staging.resolve_conflict(remote, keep_local)
+        if not keep_local:
+            self.clear_cached_state(local)
+            self._check_external_updates()
+
     def on_editor_dirty_state(self, editor):
         self.unsaved_changes = any(
             ed and getattr(ed, "dirty", False) for ed in (self.left, self.right)
@@ -536,6 +1422,7 @@ class DualEditor(tk.Tk):
         elif action == "move": e.move_by(*args)
         elif action == "zoom": e.zoom_by(args[0])
         elif action == "rotate": e.rotate_by(args[0])
+        elif action == "autofit": e.auto_fit()
 
     def _change_brush(self, d):
         if self.focused:
@@ -649,6 +1536,7 @@ class DualEditor(tk.Tk):
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to replace original:\n{e}")
                 return
+            self.on_editor_file_written(editor)
 
         messagebox.showinfo("Replace Original", f"Copied to:\n{dest_path}")
 
@@ -659,13 +1547,22 @@ class DualEditor(tk.Tk):
         return "break"
 
     def next(self, event=None, *, prompt=True):
+        if not self.pairs:
+            return
         if prompt and not self._prompt_save_if_needed():
             return
         self.index += 1
-        if self.index >= len(self.pairs): self.destroy(); return
+        if self.index >= len(self.pairs):
+            if self.job_server:
+                self._start_next_job()
+            else:
+                self.destroy()
+            return
         self._load(self.index)
 
     def prev(self):
+        if not self.pairs:
+            return
         if self.index <= 0:
             messagebox.showinfo("Start", "You are already at the first image pair.")
             return
@@ -723,35 +1620,113 @@ class DualEditor(tk.Tk):
         if not editor or not getattr(editor, "img_path", None):
             return
         try:
-            self._editor_states[editor.img_path] = editor.export_state()
+            state = editor.export_state()
+            state["cost"] = self._state_cost(editor.img_path, state)
+            _release_state(self._editor_states.pop(editor.img_path, None))
+            self._editor_states[editor.img_path] = state
         except Exception as exc:
             print(f"Failed to cache editor state for {editor.img_path}: {exc}")
-
-    def _restore_editor_state(self, editor):
-        if not editor or not getattr(editor, "img_path", None):
             return
-        state = self._editor_states.get(editor.img_path)
+        self._trim_state_cache()
+
+    def _state_cost(self, path, state):
+        images = {id(entry["image"]): entry["image"] for entry in state["history"] if entry["image"] is not None}
+        images[id(state["edit"])] = state["edit"]
+        remote = self.staging.remote_path(path) if self.staging else path
+        per_image = self.preflight.decode_cost(remote) if self.preflight else 0
+        if per_image:
+            return per_image * len(images)
+        return sum(img.size[0] * img.size[1] * 4 for img in images.values())
+
+    def _trim_state_cache(self):
+        # Oldest saved states go first; unsaved edits are never dropped.
+        total = sum(state["cost"] for state in self._editor_states.values())
+        for path in list(self._editor_states):
+            if total <= STATE_CACHE_BUDGET:
+                break
+            state = self._editor_states[path]
+            if state["dirty"] or self._is_open(path):
+                continue
+            total -= state["cost"]
+            self.clear_cached_state(path)
+
+    def _is_open(self, path):
+        return any(ed and ed.img_path == path for ed in (self.left, self.right))
+
+    def _open_editor(self, path, canvas_w, canvas_h):
+        state = self._editor_states.get(path)
         if state:
             try:
-                editor.restore_state(state)
+                return ImageEditorWidget(self, path, canvas_w, canvas_h, state=state), True
             except Exception as exc:
-                print(f"Failed to restore editor state for {editor.img_path}: {exc}")
+                print(f"Failed to restore editor state for {path}: {exc}")
+                self.clear_cached_state(path)
+        return ImageEditorWidget(self, path, canvas_w, canvas_h), False
 
     def clear_cached_state(self, path):
-        self._editor_states.pop(path, None)
+        _release_state(self._editor_states.pop(path, None))
+
+    def destroy(self):
+        if self.job_server:
+            self.job_server.close()
+            self._report_dropped_jobs()
+        if self.staging:
+            self.staging.close()
+            self._report_unsynced()
+        if self.subject_index:
+            self.subject_index.close()
+        if self.worker_pool:
+            self.worker_pool.shutdown(wait=False, cancel_futures=True)
+        super().destroy()
 
 
 def main():
-    root = tk.Tk()
-    root.withdraw()
-    folder = filedialog.askdirectory(title="Select input folder with FULL and PARTIAL")
-    root.destroy()
+    folder = sys.argv[1] if len(sys.argv) > 1 else None
     if not folder:
+        root = tk.Tk()
+        root.withdraw()
+        folder = filedialog.askdirectory(title="Select input folder with FULL and PARTIAL")
+        root.destroy()
+    if not folder:
+        return
+    if send_job(folder):
+        print(f"Queued {folder} in the running editor.")
         return
     pairs = list_image_pairs(folder)
     if not pairs:
         return
-    DualEditor(folder, pairs).mainloop()
+    job_server = None
+    if RESIDENT_MODE:
+        job_server = JobServer()
+        try:
+            job_server.start()
+        except OSError as exc:
+            # Another instance may have started in the meantime.
+            if send_job(folder):
+                print(f"Queued {folder} in the running editor.")
+                return
+            print(f"Could not start the job server, running a single job: {exc}")
+            job_server = None
+    pool = ProcessPoolExecutor() if job_server else None
+    preflight = preflight_pairs(pairs, pool=pool)
+    pairs = review_preflight(preflight)
+    if not pairs:
+        if job_server:
+            job_server.close()
+            pool.shutdown()
+        return
+    subject_index = SubjectIndex(pool=pool)
+    subject_index.prefit([path for pair in pairs for path in pair])
+    staging = StagingCache(STAGING_DIR) if STAGING_DIR else None
+    DualEditor(
+        folder,
+        pairs,
+        staging=staging,
+        preflight=preflight,
+        subject_index=subject_index,
+        job_server=job_server,
+        pool=pool,
+    ).mainloop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,51 @@
+import importlib.util
+import os
+from types import SimpleNamespace
+
+import pytest
+
+SCRIPT = os.path.join(os.path.dirname(__file__), os.pardir, "Dual photo editor_V3_PHOTOSHOP BUTTON.py")
+
+
+@pytest.fixture(scope="session")
+def editor_module():
+    pytest.importorskip("tkinter")
+    pytest.importorskip("PIL.Image")
+    spec = importlib.util.spec_from_file_location("dual_photo_editor", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def make_editor(editor_module):
+    def make(img, img_path="test.png", canvas_w=300, canvas_h=300):
+        # Skip Tk setup; only the image/history logic is exercised.
+        editor = editor_module.ImageEditorWidget.__new__(editor_module.ImageEditorWidget)
+        editor.master = SimpleNamespace(focus_editor=lambda e: None)
+        editor.img_path = str(img_path)
+        editor.canvas_w = canvas_w
+        editor.canvas_h = canvas_h
+        editor._edit = None
+        editor._set_edit(editor_module.ImageHandle(img))
+        editor.orig_size = img.size
+        editor.history = []
+        editor.history_index = -1
+        editor.saved_history_index = -1
+        editor.dirty = False
+        editor.last_mod_time = None
+        editor.zoom = 1.0
+        editor.img_pos_x = 0
+        editor.img_pos_y = 0
+        editor.rotation = 0.0
+        editor._last_scale = 1.0
+        editor._last_img_x = 0
+        editor._last_img_y = 0
+        editor.brush_radius = 1
+        editor.drawing = False
+        editor._stroke_changed = False
+        editor._render = lambda: None
+        editor._reset_history()
+        return editor
+
+    return make
@@ -0,0 +1,44 @@
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+# Slack for rounding img_pos to whole preview pixels (5 image pixels each here).
+TOLERANCE = 6
+
+
+def subject_image(size, box):
+    img = Image.new("RGBA", size, (0, 0, 0, 0))
+    img.paste((200, 30, 30, 255), box)
+    return img
+
+
+def saved_box(path):
+    return Image.open(path).getchannel("A").getbbox()
+
+
+def test_auto_fit_portrait_saves_subject_centred(make_editor, tmp_path):
+    path = tmp_path / "portrait.png"
+    editor = make_editor(subject_image((1000, 1500), (100, 300, 400, 1200)), img_path=path)
+
+    assert editor.auto_fit((0.1, 0.2, 0.4, 0.8))
+    editor.save()
+
+    # Preview is 0.2 px per image px: guides 56/272 and centre 150 map to 280/1360 and 500.
+    left, top, right, bottom = saved_box(path)
+    assert abs((left + right) / 2 - 500) <= TOLERANCE
+    assert abs(top - 280) <= TOLERANCE
+    assert abs(bottom - 1360) <= TOLERANCE
+
+
+def test_auto_fit_landscape_saves_subject_on_upper_guide(make_editor, tmp_path):
+    path = tmp_path / "landscape.png"
+    editor = make_editor(subject_image((1500, 1000), (600, 100, 900, 900)), img_path=path)
+
+    assert editor.auto_fit((0.4, 0.1, 0.6, 0.9))
+    editor.save()
+
+    # The lower guide falls outside the 1500x1000 frame, so the subject is cut there.
+    left, top, right, bottom = saved_box(path)
+    assert abs((left + right) / 2 - 750) <= TOLERANCE
+    assert abs(top - 30) <= TOLERANCE
+    assert bottom == 1000
@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def stroke(editor, x, y):
+    editor._on_down(SimpleNamespace(x=x, y=y))
+    editor._on_move(SimpleNamespace(x=x + 1, y=y))
+    editor._on_up(SimpleNamespace(x=x + 1, y=y))
+
+
+def alpha_at(img, x, y):
+    return img.getpixel((x, y))[3]
+
+
+def opaque():
+    return Image.new("RGBA", (16, 16), (255, 0, 0, 255))
+
+
+def test_stroke_undo_stroke_undo_restores_original(make_editor):
+    editor = make_editor(opaque())
+
+    stroke(editor, 4, 4)
+    assert alpha_at(editor.edit_pil, 4, 4) == 0
+    editor.undo()
+    assert alpha_at(editor.edit_pil, 4, 4) == 255
+
+    stroke(editor, 10, 10)
+    assert alpha_at(editor.edit_pil, 10, 10) == 0
+    editor.undo()
+    assert alpha_at(editor.edit_pil, 10, 10) == 255
+    assert alpha_at(editor.edit_pil, 4, 4) == 255
+
+    editor.redo()
+    assert alpha_at(editor.edit_pil, 10, 10) == 0
+    assert alpha_at(editor.history[0]["image"].image, 10, 10) == 255
+
+
+def test_stroke_after_restore_leaves_cached_state_untouched(make_editor):
+    first = make_editor(opaque())
+    stroke(first, 4, 4)
+    state = first.export_state()
+
+    second = make_editor(Image.new("RGBA", (4, 4), (0, 0, 0, 0)))
+    second.restore_state(state)
+    assert second.orig_size == (16, 16)
+    stroke(second, 10, 10)
+
+    assert alpha_at(second.edit_pil, 10, 10) == 0
+    assert alpha_at(state["edit"].image, 10, 10) == 255
+    assert alpha_at(first.edit_pil, 10, 10) == 255
+    for entry in state["history"]:
+        assert alpha_at(entry["image"].image, 10, 10) == 255
+
+    second.undo()
+    assert alpha_at(second.edit_pil, 10, 10) == 255
+    assert alpha_at(second.edit_pil, 4, 4) == 0
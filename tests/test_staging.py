@@ -0,0 +1,112 @@
+import os
+
+
+def write(path, content, mtime):
+    with open(path, "w") as f:
+        f.write(content)
+    os.utime(path, (mtime, mtime))
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def make_remote(tmp_path):
+    full = tmp_path / "nas" / "FULL"
+    full.mkdir(parents=True)
+    remote = str(full / "a.jpg")
+    write(remote, "nas", 1_000_000)
+    return remote
+
+
+def test_stage_edit_sync(editor_module, tmp_path):
+    remote = make_remote(tmp_path)
+    cache = editor_module.StagingCache(str(tmp_path / "ssd"))
+    try:
+        local = cache.local_path(remote)
+        assert local != remote
+        assert read(local) == "nas"
+
+        write(local, "edited", 1_000_100)
+        cache.write_back(local)
+        cache.flush()
+
+        assert read(remote) == "edited"
+        assert cache.unsynced() == []
+        assert cache.drain_events() == []
+    finally:
+        cache.close()
+
+
+def test_nas_change_is_reported_not_overwritten(editor_module, tmp_path):
+    remote = make_remote(tmp_path)
+    cache = editor_module.StagingCache(str(tmp_path / "ssd"))
+    try:
+        local = cache.local_path(remote)
+        write(remote, "external", 1_000_050)
+        write(local, "edited", 1_000_100)
+        cache.write_back(local)
+        cache.flush()
+
+        assert read(remote) == "external"
+        assert cache.drain_events() == [("conflict", remote, local)]
+        assert cache.unsynced() == [(remote, local)]
+    finally:
+        cache.close()
+
+
+def test_manifest_reload_keeps_unsynced_copy(editor_module, tmp_path):
+    remote = make_remote(tmp_path)
+    root = str(tmp_path / "ssd")
+    cache = editor_module.StagingCache(root)
+    local = cache.local_path(remote)
+    write(remote, "external", 1_000_050)
+    write(local, "edited", 1_000_100)
+    cache.close()
+
+    reopened = editor_module.StagingCache(root)
+    try:
+        reopened.flush()
+        assert reopened.local_path(remote) == local
+        assert read(local) == "edited"
+        assert read(remote) == "external"
+        assert reopened.drain_events() == [("conflict", remote, local)]
+
+        reopened.resolve_conflict(remote, keep_local=True)
+        reopened.flush()
+        assert read(remote) == "edited"
+    finally:
+        reopened.close()
+
+
+def test_reused_copy_is_refreshed_after_nas_change(editor_module, tmp_path):
+    remote = make_remote(tmp_path)
+    cache = editor_module.StagingCache(str(tmp_path / "ssd"))
+    try:
+        local = cache.local_path(remote)
+        write(remote, "external", 1_000_050)
+
+        # The finished copy is handed out at once and re-checked in the background;
+        # the next call waits for (or reuses) that re-check.
+        assert cache.local_path(remote) == local
+        assert cache.local_path(remote) == local
+        assert read(local) == "external"
+    finally:
+        cache.close()
+
+
+def test_remote_path_follows_staged_copies(editor_module, tmp_path):
+    remote = make_remote(tmp_path)
+    root = str(tmp_path / "ssd")
+    cache = editor_module.StagingCache(root)
+    local = cache.local_path(remote)
+    assert cache.remote_path(local) == remote
+    assert cache.remote_path(remote) is None
+    cache.close()
+
+    reopened = editor_module.StagingCache(root)
+    try:
+        assert reopened.remote_path(local) == remote
+    finally:
+        reopened.close()